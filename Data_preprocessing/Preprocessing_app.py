@@ -2,6 +2,7 @@ from geopy.geocoders import Photon
 from geopy.exc import GeocoderTimedOut, GeocoderUnavailable
 import time
 from Data_preprocessing.feature_engineering import encode_distance, encode_single_categorical, new_column_sum, withdraw_columns
+from Data_preprocessing.poi_features import POI_FILE, load_poi_index, encode_poi_features, poi_feature_names
 
 def geocode_address(address, sleep=0.3):
     """
@@ -34,7 +35,7 @@ def geocode_address(address, sleep=0.3):
         time.sleep(2)
     return None, None
 
-def preprocessin_app(df):
+def preprocessin_app(df, feature_names=None):
     """
     Preprocess a single rental listing for inference in the Streamlit app.
 
@@ -49,11 +50,20 @@ def preprocessin_app(df):
     ----------
     df : pandas.DataFrame
         Input DataFrame containing a single rental listing.
+    feature_names : array-like of str, optional
+        Features expected by the model (e.g., `model.feature_names_in_`).
+        POI features are only computed if the model uses them. By default,
+        they are computed whenever the POI file is available.
 
     Returns
     -------
     pandas.DataFrame
         Preprocessed DataFrame ready for model inference.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the model uses POI features and the POI file is missing.
     """
     # Preprocessing steps for the inference in the streamlit app
     # Calculating the lattitude and the longitude from the adress
@@ -96,6 +106,17 @@ def preprocessin_app(df):
     lon_dor = -79.2846
     df = encode_distance(df, 'distance to Dorset Park (km)', lat_dor, lon_dor)
 
+    #Encode points of interest around the listing, if the model uses them
+    poi_index = load_poi_index()
+    if feature_names is None:
+        use_poi = poi_index is not None
+    else:
+        use_poi = bool(set(poi_feature_names()) & set(feature_names))
+        if use_poi and poi_index is None:
+            raise FileNotFoundError(f"The model uses POI features but the POI file {POI_FILE} is missing.")
+    if use_poi:
+        df = encode_poi_features(df, poi_index)
+
     # Encode Furnished or not
     Binary_mapping ={
         'No': 0,
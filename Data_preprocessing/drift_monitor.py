@@ -0,0 +1,311 @@
+import json
+import os
+import threading
+import numpy as np
+import pandas as pd
+
+# Bounding box of the City of Toronto, used to flag geocodes outside the city
+TORONTO_LAT = (43.58, 43.86)
+TORONTO_LON = (-79.64, -79.11)
+
+def numeric_sketch(values, n_bins=10):
+    """
+    Build a fixed-size histogram sketch of a numerical feature.
+
+    Bin edges are the reference quantiles, so the sketch also serves as a
+    quantile sketch. Two open-ended bins collect values below the reference
+    minimum and above the reference maximum.
+
+    Parameters
+    ----------
+    values : pandas.Series
+        Reference values of the feature.
+    n_bins : int, optional
+        Number of quantile bins (default is 10).
+
+    Returns
+    -------
+    dict
+        Sketch with the bin 'edges', the 'counts' per bin and the number
+        of 'missing' values.
+
+    Raises
+    ------
+    ValueError
+        If `values` has no numerical value.
+    """
+    values = pd.to_numeric(values, errors='coerce')
+    observed = values.dropna().to_numpy(dtype=float)
+    if len(observed) == 0:
+        raise ValueError("Cannot build a numeric sketch without any value, use `categorical_sketch` instead.")
+    edges = np.unique(np.quantile(observed, np.linspace(0, 1, n_bins + 1)))
+    if len(edges) == 1:
+        # Constant feature: keep one bin between the two open-ended ones
+        edges = np.repeat(edges, 2)
+    sketch = {'type': 'numeric', 'edges': edges, 'counts': np.zeros(len(edges) + 1, dtype=np.int64), 'missing': 0}
+    update_sketch(sketch, values)
+    return sketch
+
+def categorical_sketch(values):
+    """
+    Build a fixed-size count sketch of a categorical feature.
+
+    Categories unseen in the reference data are counted in a single
+    'other' bin so the memory does not grow with the traffic.
+
+    Parameters
+    ----------
+    values : pandas.Series
+        Reference values of the feature.
+
+    Returns
+    -------
+    dict
+        Sketch with the reference 'categories', the 'counts' per category
+        (last bin is 'other') and the number of 'missing' values.
+    """
+    categories = sorted(values.dropna().unique())
+    sketch = {'type': 'categorical', 'categories': categories,
+              'index': {category: i for i, category in enumerate(categories)},
+              'counts': np.zeros(len(categories) + 1, dtype=np.int64), 'missing': 0}
+    update_sketch(sketch, values)
+    return sketch
+
+def update_sketch(sketch, values):
+    """
+    Add values to a sketch in place.
+
+    The cost per value is constant: a binary search over the fixed bin
+    edges or a dictionary lookup.
+
+    Parameters
+    ----------
+    sketch : dict
+        Sketch returned by `numeric_sketch` or `categorical_sketch`.
+    values : pandas.Series
+        New values of the feature.
+    """
+    if sketch['type'] == 'numeric':
+        values = pd.to_numeric(values, errors='coerce')
+    missing = values.isna().to_numpy()
+    sketch['missing'] += int(missing.sum())
+    values = values[~missing]
+    if sketch['type'] == 'numeric':
+        values = values.to_numpy(dtype=float)
+        bins = np.searchsorted(sketch['edges'], values, side='right')
+        # Values equal to the reference maximum belong to the last quantile bin
+        bins[values == sketch['edges'][-1]] = len(sketch['edges']) - 1
+    else:
+        other = len(sketch['categories'])
+        bins = np.array([sketch['index'].get(value, other) for value in values], dtype=np.int64)
+    np.add.at(sketch['counts'], bins, 1)
+
+def empty_sketch(reference):
+    """
+    Create an empty sketch sharing the bins of a reference sketch.
+
+    Parameters
+    ----------
+    reference : dict
+        Reference sketch.
+
+    Returns
+    -------
+    dict
+        Sketch with the same bins and zero counts.
+    """
+    sketch = dict(reference)
+    sketch['counts'] = np.zeros_like(reference['counts'])
+    sketch['missing'] = 0
+    return sketch
+
+def psi_score(reference_counts, live_counts, eps=1e-4):
+    """
+    Compute the Population Stability Index between two histograms.
+
+    Parameters
+    ----------
+    reference_counts : numpy.ndarray
+        Counts per bin of the reference data.
+    live_counts : numpy.ndarray
+        Counts per bin of the live data.
+    eps : float, optional
+        Floor applied to the bin proportions to avoid empty bins (default is 1e-4).
+
+    Returns
+    -------
+    float
+        PSI score. Values above 0.2 are usually considered a significant drift.
+    """
+    p = np.maximum(reference_counts / max(reference_counts.sum(), 1), eps)
+    q = np.maximum(live_counts / max(live_counts.sum(), 1), eps)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+def ks_score(reference_counts, live_counts):
+    """
+    Compute the Kolmogorov-Smirnov statistic between two histograms.
+
+    The statistic is evaluated at the bin edges, which are the reference
+    quantiles for numerical features.
+
+    Parameters
+    ----------
+    reference_counts : numpy.ndarray
+        Counts per bin of the reference data.
+    live_counts : numpy.ndarray
+        Counts per bin of the live data.
+
+    Returns
+    -------
+    float
+        Maximum distance between the two cumulative distributions.
+    """
+    p = np.cumsum(reference_counts) / max(reference_counts.sum(), 1)
+    q = np.cumsum(live_counts) / max(live_counts.sum(), 1)
+    return float(np.max(np.abs(q - p)))
+
+def build_reference(df, categorical_columns=('Building Type',), n_bins=10):
+    """
+    Compute the reference sketches of the training features.
+
+    Numerical features with at most `n_bins` distinct values (binary
+    flags, counts of rooms or parking spaces) are sketched as categories,
+    so each value keeps its own bin. Columns without any value are
+    sketched as categories too, with every live value counted as 'other'.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Feature-engineered training data (without the target column).
+    categorical_columns : tuple of str, optional
+        Columns sketched as categories (default is ('Building Type',)).
+    n_bins : int, optional
+        Number of quantile bins for numerical features (default is 10).
+
+    Returns
+    -------
+    dict
+        Reference sketch for each column.
+    """
+    reference = {}
+    for column in df.columns:
+        if column in categorical_columns or df[column].nunique() <= n_bins:
+            reference[column] = categorical_sketch(df[column])
+        else:
+            reference[column] = numeric_sketch(df[column], n_bins)
+    return reference
+
+class DriftMonitor:
+    """
+    Streaming drift monitor over the preprocessed inference inputs.
+
+    Keeps one fixed-size sketch per feature, with the bins of the reference
+    sketches computed on the training data, and compares the live traffic
+    with the reference using PSI scores, and KS scores for the numerical
+    features. A single monitor can be
+    shared by several threads.
+
+    Parameters
+    ----------
+    reference : dict
+        Reference sketches returned by `build_reference`.
+    metrics_path : str, optional
+        JSON file where the metrics are written by `update` (default is
+        None, no automatic dump).
+    dump_every : int, optional
+        Number of listings between two automatic dumps (default is 50).
+    """
+
+    def __init__(self, reference, metrics_path=None, dump_every=50):
+        self.reference = reference
+        self.live = {column: empty_sketch(sketch) for column, sketch in reference.items()}
+        self.n_requests = 0
+        self.outside_toronto = 0
+        self.metrics_path = metrics_path
+        self.dump_every = dump_every
+        self._lock = threading.RLock()
+
+    def update(self, df):
+        """
+        Add preprocessed listings to the live sketches.
+
+        The metrics are written to `metrics_path` each time another
+        `dump_every` listings have been added.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            Output of `preprocessin_app`.
+        """
+        outside_toronto = 0
+        if {'latitude', 'longitude'} <= set(df.columns):
+            lat = pd.to_numeric(df['latitude'], errors='coerce')
+            lon = pd.to_numeric(df['longitude'], errors='coerce')
+            inside = lat.between(*TORONTO_LAT) & lon.between(*TORONTO_LON)
+            outside_toronto = int((lat.notna() & ~inside).sum())
+        with self._lock:
+            previous = self.n_requests
+            self.n_requests += len(df)
+            self.outside_toronto += outside_toronto
+            for column, sketch in self.live.items():
+                if column in df.columns:
+                    update_sketch(sketch, df[column])
+            if self.metrics_path is not None and self.n_requests // self.dump_every > previous // self.dump_every:
+                self.dump_metrics(self.metrics_path)
+
+    def report(self):
+        """
+        Compare the live sketches with the reference sketches.
+
+        Returns
+        -------
+        pandas.DataFrame
+            PSI, KS and the rates of missing and out-of-reference values
+            for each feature, sorted by decreasing PSI. KS is NaN for
+            categorical sketches.
+        """
+        with self._lock:
+            live_sketches = {column: (live['counts'].copy(), live['missing'], live['type'])
+                             for column, live in self.live.items()}
+            n_requests = self.n_requests
+        rows = []
+        for column, (counts, missing, sketch_type) in live_sketches.items():
+            reference = self.reference[column]
+            if sketch_type == 'numeric':
+                # Open-ended bins below the reference minimum and above the maximum
+                out_of_range = counts[0] + counts[-1]
+            else:
+                out_of_range = counts[-1]
+            rows.append({
+                'feature': column,
+                'psi': psi_score(reference['counts'], counts),
+                # Categories have no order, so KS is only defined for numerical features
+                'ks': ks_score(reference['counts'], counts) if sketch_type == 'numeric' else np.nan,
+                'missing rate': missing / max(n_requests, 1),
+                'out of reference rate': out_of_range / max(counts.sum(), 1),
+            })
+        return pd.DataFrame(rows).sort_values('psi', ascending=False, ignore_index=True)
+
+    def dump_metrics(self, path):
+        """
+        Write the drift metrics to a JSON file.
+
+        The file is written to a temporary file first and then renamed, so
+        readers never see a partially written file.
+
+        Parameters
+        ----------
+        path : str
+            Destination file.
+        """
+        with self._lock:
+            metrics = {
+                'requests': self.n_requests,
+                'outside Toronto': self.outside_toronto,
+                # NaN scores (KS of categorical features) are written as null
+                'features': self.report().astype(object).where(lambda r: r.notna(), None).to_dict(orient='records'),
+            }
+            tmp_path = f'{path}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(metrics, f, indent=2)
+            os.replace(tmp_path, path)
@@ -1,5 +1,6 @@
 import numpy as np
 import pandas as pd
+from Data_preprocessing.poi_features import load_poi_index, encode_poi_features
 
 def withdraw_columns(df, columns_to_remove):
     """
@@ -92,7 +93,9 @@ def encode_multiple_columns(df, old_column, new_columns, mapping):
     pandas.DataFrame
         DataFrame with expanded encoded columns.
     """
-    df[new_columns] = df[old_column].map(mapping).apply(pd.Series)
+    # Reindex so that a batch without any mapped value still yields every column
+    encoded = df[old_column].map(mapping).apply(pd.Series)
+    df[new_columns] = encoded.reindex(columns=range(len(new_columns)))
     df = df.drop(columns=[old_column])
     return df
 
@@ -204,6 +207,72 @@ def new_column_sum(df, new_column, column_1, column_2):
     return df
 
 
+def clean_size(df, name_column):
+    """
+    Convert property size values to numeric format.
+
+    Placeholder values ('Not Available') become missing values and
+    thousands separators are removed before casting to float.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Input DataFrame.
+    name_column : str
+        Name of the size column (e.g., 'Size (sqft)').
+
+    Returns
+    -------
+    pandas.DataFrame
+        DataFrame with the size column cast to float.
+    """
+    size = df[name_column].replace('Not Available', np.nan)
+    df[name_column] = size.astype('string').str.replace(',', '').astype(float)
+    return df
+
+def size_group_means(df, name_column, column_mean):
+    """
+    Compute the mean property size for each group of another feature.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        DataFrame with a numeric size column (see `clean_size`).
+    name_column : str
+        Name of the size column.
+    column_mean : str
+        Column used to group the listings (e.g., number of rooms).
+
+    Returns
+    -------
+    pandas.Series
+        Mean size indexed by the values of `column_mean`.
+    """
+    return df.groupby(column_mean)[name_column].mean()
+
+def impute_size(df, name_column, column_mean, mean_size):
+    """
+    Impute missing property sizes from precomputed group means.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        DataFrame with a numeric size column (see `clean_size`).
+    name_column : str
+        Name of the size column.
+    column_mean : str
+        Column whose values index `mean_size`.
+    mean_size : pandas.Series
+        Mean size per group, as returned by `size_group_means`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        DataFrame with missing sizes replaced by their group mean.
+    """
+    df[name_column] = df[name_column].fillna(df[column_mean].map(mean_size))
+    return df
+
 def encode_size(df, name_column, column_mean):
     """
     Clean and impute property size values.
@@ -225,21 +294,18 @@ def encode_size(df, name_column, column_mean):
     pandas.DataFrame
         DataFrame with cleaned and imputed size values.
     """
-    df[name_column] = df[name_column].replace('Not Available', np.nan)
-    df[name_column] = df[name_column].str.replace(',','')
-    df[name_column] = df[name_column].astype(float)
-    mean_size_per_room = df.groupby(column_mean)[name_column].mean()
-    df[name_column] = df.apply(
-        lambda row: mean_size_per_room[row[column_mean]] if pd.isna(row[name_column]) else row[name_column], axis=1)
+    df = clean_size(df, name_column)
+    mean_size = size_group_means(df, name_column, column_mean)
+    df = impute_size(df, name_column, column_mean, mean_size)
     return df
 
-def feature_engineering_Toronto(df):
+def feature_engineering_stage_one(df):
     """
-    Perform full feature engineering pipeline for Toronto rental data.
+    Row-local feature engineering steps run before size imputation.
 
-    This function cleans the dataset, encodes categorical variables,
-    creates derived features, computes geographic distances, and prepares
-    the data for machine learning models.
+    Drops unused columns, filters rows on price, encodes the room,
+    parking and policy columns, creates the total rooms column and
+    converts the size column to numeric values.
 
     Parameters
     ----------
@@ -249,7 +315,7 @@ def feature_engineering_Toronto(df):
     Returns
     -------
     pandas.DataFrame
-        Fully processed DataFrame ready for modeling.
+        Partially processed DataFrame with a numeric 'Size (sqft)' column.
     """
     # Remove unnecessary columns and filter rows based on price
     column_delete = ['Unnamed: 0','Address',"Title", 'Date Posted', 'Move-In Date', 'Visit Counter', 'url', 'Description',
@@ -324,8 +390,32 @@ def feature_engineering_Toronto(df):
     #Create new column for total rooms
     df = new_column_sum(df, 'Rooms', 'Bedrooms', 'Bathrooms')
 
-    #Encoding Size (sqft)
-    df = encode_size(df, 'Size (sqft)', 'Rooms')
+    #Clean Size (sqft), imputation needs the means over the full dataset
+    df = clean_size(df, 'Size (sqft)')
+
+    return df
+
+def feature_engineering_stage_two(df, mean_size):
+    """
+    Row-local feature engineering steps run after the size group means are known.
+
+    Imputes missing sizes, encodes the multi-valued columns and appliances,
+    and computes distances to reference Toronto locations.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        DataFrame returned by `feature_engineering_stage_one`.
+    mean_size : pandas.Series
+        Mean 'Size (sqft)' per number of rooms, computed on the full dataset.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Fully processed DataFrame ready for modeling.
+    """
+    #Impute Size (sqft)
+    df = impute_size(df, 'Size (sqft)', 'Rooms', mean_size)
 
     #Encode Wifi and Cable TV
     wifi_mapping = {
@@ -404,5 +494,33 @@ def feature_engineering_Toronto(df):
     lon_dor = -79.2846
     df = encode_distance(df, 'distance to Dorset Park (km)', lat_dor, lon_dor)
 
+    #Encode points of interest around the listing, if a POI file is available
+    poi_index = load_poi_index()
+    if poi_index is not None:
+        df = encode_poi_features(df, poi_index)
+
     return df
 
+def feature_engineering_Toronto(df):
+    """
+    Perform full feature engineering pipeline for Toronto rental data.
+
+    This function cleans the dataset, encodes categorical variables,
+    creates derived features, computes geographic distances, and prepares
+    the data for machine learning models.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Raw Toronto rental listings DataFrame.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Fully processed DataFrame ready for modeling.
+    """
+    df = feature_engineering_stage_one(df)
+    #Size group means need every row, the other steps are row-local
+    mean_size = size_group_means(df, 'Size (sqft)', 'Rooms')
+    df = feature_engineering_stage_two(df, mean_size)
+    return df
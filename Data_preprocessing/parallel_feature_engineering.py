@@ -0,0 +1,131 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from Data_preprocessing.feature_engineering import (feature_engineering_Toronto, feature_engineering_stage_one,
+                                                    feature_engineering_stage_two, size_group_means)
+from Data_preprocessing.poi_features import load_poi_index
+
+def split_partitions(df, n_partitions):
+    """
+    Split a DataFrame into contiguous row partitions.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Input DataFrame.
+    n_partitions : int
+        Number of partitions to create. Capped at the number of rows.
+
+    Returns
+    -------
+    list of pandas.DataFrame
+        Partitions in the original row order.
+    """
+    n_partitions = max(1, min(n_partitions, len(df)))
+    bounds = np.linspace(0, len(df), n_partitions + 1).astype(int)
+    return [df.iloc[start:stop].copy() for start, stop in zip(bounds[:-1], bounds[1:])]
+
+def feature_engineering_Toronto_parallel(df, n_jobs=None):
+    """
+    Run the Toronto feature engineering pipeline on a process pool.
+
+    The cheap row-local steps before size imputation and the size means
+    per number of rooms run in the parent process on the whole DataFrame.
+    The result is then split into contiguous partitions, and the remaining
+    row-local steps, which hold almost all the cost, run on each partition
+    with these global means. The concatenated output is identical to
+    `feature_engineering_Toronto`.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Raw Toronto rental listings DataFrame.
+    n_jobs : int, optional
+        Number of worker processes (default is the number of CPU cores).
+        Negative values follow the joblib convention: -1 uses all the
+        cores, -2 all but one, and so on.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Fully processed DataFrame ready for modeling.
+
+    Raises
+    ------
+    ValueError
+        If `n_jobs` is 0.
+    """
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    elif n_jobs == 0:
+        raise ValueError("n_jobs == 0 has no meaning, use a positive number of workers or -1 for all cores.")
+    n_jobs = effective_n_jobs(n_jobs)
+    if n_jobs == 1:
+        return feature_engineering_Toronto(df)
+
+    # Row-local steps up to the numeric size column, and the global size statistics
+    df = feature_engineering_stage_one(df)
+    mean_size = size_group_means(df, 'Size (sqft)', 'Rooms')
+    if len(df) == 0:
+        return feature_engineering_stage_two(df, mean_size)
+    # Build the POI index cache once before the workers load it
+    load_poi_index()
+    # Impute with the global means and finish the row-local steps on each partition
+    partitions = split_partitions(df, n_jobs)
+    partitions = Parallel(n_jobs=len(partitions))(
+        delayed(feature_engineering_stage_two)(part, mean_size) for part in partitions)
+    return pd.concat(partitions)
+
+def benchmark_feature_engineering(df, n_jobs_list=None, repeat=3):
+    """
+    Measure the speedup of the parallel feature engineering pipeline.
+
+    Each configuration is timed `repeat` times and the best time is kept.
+    The output of every parallel run is checked against the serial run.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Raw Toronto rental listings DataFrame.
+    n_jobs_list : list of int, optional
+        Numbers of worker processes to benchmark (default is powers of two
+        up to the number of CPU cores).
+    repeat : int, optional
+        Number of timed runs per configuration (default is 3).
+
+    Returns
+    -------
+    pandas.DataFrame
+        Best time in seconds and speedup over the serial run for each
+        number of cores.
+    """
+    if n_jobs_list is None:
+        n_cores = os.cpu_count() or 1
+        n_jobs_list = sorted({2 ** i for i in range(int(np.log2(n_cores)) + 1)} | {n_cores})
+
+    def best_time(function, **kwargs):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = function(df.copy(), **kwargs)
+            times.append(time.perf_counter() - start)
+        return min(times), result
+
+    serial_time, serial_result = best_time(feature_engineering_Toronto)
+    rows = [{'cores': 1, 'time (s)': serial_time, 'speedup': 1.0}]
+    for n_jobs in n_jobs_list:
+        if n_jobs == 1:
+            continue
+        parallel_time, parallel_result = best_time(feature_engineering_Toronto_parallel, n_jobs=n_jobs)
+        pd.testing.assert_frame_equal(parallel_result, serial_result)
+        rows.append({'cores': n_jobs, 'time (s)': parallel_time, 'speedup': serial_time / parallel_time})
+    return pd.DataFrame(rows)
+
+if __name__ == '__main__':
+    # Benchmark on the scraped dataset replicated to the size of a large batch
+    df = pd.read_csv('./Data/Toronto_rental_location.csv')
+    df = pd.concat([df] * 20, ignore_index=True)
+    print(f"Rows: {len(df)}")
+    print(benchmark_feature_engineering(df).to_string(index=False))
@@ -0,0 +1,135 @@
+import os
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import BallTree
+
+EARTH_RADIUS_KM = 6371.0
+POI_FILE = './Data/Toronto_poi.csv'
+POI_INDEX_FILE = './Data/Toronto_poi_index.pkl'
+
+# POI categories (values of the 'category' column of the POI file) and their feature names
+NEAREST_CATEGORIES = {'subway': 'distance to nearest subway (km)'}
+COUNT_CATEGORIES = {'transit': 'transit stops', 'park': 'parks', 'grocery': 'grocery stores'}
+COUNT_RADII_KM = (0.5, 1.0)
+
+# Indexes loaded in this process, keyed by (poi_file, index_file)
+_poi_indexes = {}
+
+def poi_feature_names():
+    """
+    List the names of the columns added by `encode_poi_features`.
+
+    Returns
+    -------
+    list of str
+        Names of the POI feature columns.
+    """
+    names = list(NEAREST_CATEGORIES.values())
+    for name in COUNT_CATEGORIES.values():
+        names += [f'{name} within {int(radius * 1000)} m' for radius in COUNT_RADII_KM]
+    return names
+
+def build_poi_index(poi_file=POI_FILE):
+    """
+    Build one BallTree per POI category with the haversine metric.
+
+    Parameters
+    ----------
+    poi_file : str, optional
+        CSV file with 'category', 'latitude' and 'longitude' columns.
+
+    Returns
+    -------
+    dict
+        BallTree per category under the key 'trees', and the modification
+        time of the POI file under the key 'mtime'.
+    """
+    poi = pd.read_csv(poi_file).dropna(subset=['latitude', 'longitude'])
+    index = {'mtime': os.path.getmtime(poi_file), 'trees': {}}
+    for category, group in poi.groupby('category'):
+        coordinates = np.radians(group[['latitude', 'longitude']].to_numpy(dtype=float))
+        index['trees'][category] = BallTree(coordinates, metric='haversine')
+    return index
+
+def load_poi_index(poi_file=POI_FILE, index_file=POI_INDEX_FILE):
+    """
+    Load the POI spatial index, building and caching it on disk if needed.
+
+    The index is loaded once per process and per pair of files. It is
+    reloaded, and rebuilt if needed, when the POI file has changed since
+    the index was built.
+
+    Parameters
+    ----------
+    poi_file : str, optional
+        CSV file with the points of interest.
+    index_file : str, optional
+        File where the index is cached.
+
+    Returns
+    -------
+    dict or None
+        Spatial index returned by `build_poi_index`, or None if the POI
+        file does not exist.
+    """
+    if not os.path.exists(poi_file):
+        return None
+    mtime = os.path.getmtime(poi_file)
+    key = (poi_file, index_file)
+    index = _poi_indexes.get(key)
+    if index is not None and index['mtime'] == mtime:
+        return index
+    if os.path.exists(index_file):
+        index = joblib.load(index_file)
+        if index['mtime'] == mtime:
+            _poi_indexes[key] = index
+            return index
+    index = build_poi_index(poi_file)
+    joblib.dump(index, index_file)
+    _poi_indexes[key] = index
+    return index
+
+def encode_poi_features(df, index):
+    """
+    Encode distances to the nearest POIs and POI counts around each listing.
+
+    Adds the distance to the nearest POI of each category in
+    `NEAREST_CATEGORIES` and the number of POIs of each category in
+    `COUNT_CATEGORIES` within each radius of `COUNT_RADII_KM`. Listings
+    without coordinates get missing values.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        DataFrame containing 'latitude' and 'longitude' columns.
+    index : dict
+        Spatial index returned by `load_poi_index`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        DataFrame with the POI features added.
+    """
+    coordinates = df[['latitude', 'longitude']].astype(float).to_numpy()
+    located = ~np.isnan(coordinates).any(axis=1)
+    points = np.radians(coordinates[located])
+
+    for category, name in NEAREST_CATEGORIES.items():
+        values = np.full(len(df), np.nan)
+        tree = index['trees'].get(category)
+        if tree is not None and len(points):
+            distance, _ = tree.query(points, k=1)
+            values[located] = distance[:, 0] * EARTH_RADIUS_KM
+        df[name] = values
+
+    for category, name in COUNT_CATEGORIES.items():
+        tree = index['trees'].get(category)
+        for radius in COUNT_RADII_KM:
+            values = np.full(len(df), np.nan)
+            if tree is None:
+                values[located] = 0
+            elif len(points):
+                values[located] = tree.query_radius(points, r=radius / EARTH_RADIUS_KM, count_only=True)
+            df[f'{name} within {int(radius * 1000)} m'] = values
+    return df
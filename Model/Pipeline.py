@@ -4,7 +4,7 @@ from sklearn.impute import SimpleImputer
 from sklearn.compose import ColumnTransformer
 from xgboost import XGBRegressor
 
-def full_pipeline(df):
+def full_pipeline(df, n_estimators=200, max_depth=7, early_stopping_rounds=None):
     """
     Create a complete machine learning pipeline for Toronto rental data.
 
@@ -21,6 +21,13 @@ def full_pipeline(df):
     ----------
     df : pandas.DataFrame
         Input DataFrame (used only to infer column names for transformations).
+    n_estimators : int, optional
+        Maximum number of boosting rounds (default is 200).
+    max_depth : int, optional
+        Maximum depth of each tree (default is 7).
+    early_stopping_rounds : int, optional
+        Stop boosting when the validation error has not improved for this
+        many rounds (default is None, no early stopping).
 
     Returns
     -------
@@ -59,7 +66,8 @@ def full_pipeline(df):
     )
 
     #Define the ML model
-    model = XGBRegressor(n_estimators = 200, max_depth = 7, learning_rate = 0.05, subsample = 0.8)
+    model = XGBRegressor(n_estimators = n_estimators, max_depth = max_depth, learning_rate = 0.05, subsample = 0.8,
+                         early_stopping_rounds = early_stopping_rounds)
 
     # Combine the preprocessor and model into a full pipeline
     full_pip = Pipeline([
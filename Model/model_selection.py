@@ -0,0 +1,129 @@
+import time
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import r2_score
+from sklearn.model_selection import train_test_split
+from Model.Pipeline import full_pipeline
+
+def measure_latency(boosters, X, repeat=50):
+    """
+    Measure the prediction latency of several boosters.
+
+    The boosters are timed alone on features that already went through
+    the preprocessor, so the time reflects the cost of the trees. They are
+    timed in turn within each run, so a change of load on the machine
+    affects all of them alike, and the median over the runs is kept.
+
+    Parameters
+    ----------
+    boosters : list of xgboost.Booster
+        Trained boosters.
+    X : numpy.ndarray
+        Preprocessed rows to predict.
+    repeat : int, optional
+        Number of timed runs (default is 50).
+
+    Returns
+    -------
+    numpy.ndarray
+        Median prediction time in seconds of each booster.
+    """
+    times = np.empty((repeat, len(boosters)))
+    for run in range(repeat):
+        for i, booster in enumerate(boosters):
+            start = time.perf_counter()
+            booster.inplace_predict(X)
+            times[run, i] = time.perf_counter() - start
+    return np.median(times, axis=0)
+
+def pareto_report(X_train, y_train, depths=(3, 4, 5, 6, 7), n_trees=(25, 50, 100, 150, 200),
+                  early_stopping_rounds=20, batch_size=2048):
+    """
+    Compare validation accuracy and prediction latency over tree depths and counts.
+
+    The training data is split into a fitting and a validation set. For
+    each depth, a model with `max(n_trees)` rounds is trained with early
+    stopping on the validation set. It is then truncated to each tree
+    count up to the best iteration and evaluated on the validation set.
+
+    The Pareto front uses the measured batch latency of the booster alone.
+    Single-row latency is reported too, but it is mostly the fixed cost of
+    a call to xgboost and barely depends on the size of the model.
+
+    Parameters
+    ----------
+    X_train, y_train : pandas.DataFrame, pandas.Series
+        Training features and target.
+    depths : tuple of int, optional
+        Maximum tree depths to evaluate.
+    n_trees : tuple of int, optional
+        Numbers of boosting rounds to evaluate.
+    early_stopping_rounds : int, optional
+        Early stopping patience on the validation set (default is 20).
+    batch_size : int, optional
+        Number of rows of the batch used to measure the batch latency,
+        repeated from the validation set (default is 2048).
+
+    Returns
+    -------
+    pandas.DataFrame
+        Validation R² and MRE, single-row and batch latency for each
+        candidate, and a 'pareto' flag for the candidates not dominated
+        in accuracy and batch latency.
+    """
+    X_fit, X_val, y_fit, y_val = train_test_split(X_train, y_train, test_size=0.2, random_state=42)
+    rows, candidates = [], []
+    for depth in depths:
+        pipeline = full_pipeline(X_train, n_estimators=max(n_trees), max_depth=depth,
+                                 early_stopping_rounds=early_stopping_rounds)
+        # The evaluation set must go through the preprocessor fitted on the fitting rows
+        preprocessor = clone(pipeline.named_steps['preprocessor']).fit(X_fit)
+        X_val_pre = preprocessor.transform(X_val)
+        pipeline.fit(X_fit, y_fit, model__eval_set=[(X_val_pre, y_val)], model__verbose=False)
+        booster = pipeline.named_steps['model'].get_booster()
+        best_n_trees = pipeline.named_steps['model'].best_iteration + 1
+
+        for n in sorted({min(n, best_n_trees) for n in n_trees}):
+            candidate = booster[:n]
+            y_pred = candidate.inplace_predict(X_val_pre)
+            rows.append({
+                'max_depth': depth,
+                'n_trees': n,
+                'r2': r2_score(y_val, y_pred),
+                'mre': np.mean(np.abs((y_val - y_pred) / y_val)),
+            })
+            candidates.append(candidate)
+
+    report = pd.DataFrame(rows)
+    # Latencies are measured once all candidates are trained, on a batch large
+    # enough for the cost of the trees to dominate the cost of the call
+    X_batch = np.tile(X_val_pre, (int(np.ceil(batch_size / len(X_val_pre))), 1))[:batch_size]
+    report['single-row latency (ms)'] = 1000 * measure_latency(candidates, X_val_pre[:1])
+    report['batch latency (ms)'] = 1000 * measure_latency(candidates, X_batch)
+    cost = report['batch latency (ms)'].to_numpy()
+    r2 = report['r2'].to_numpy()
+    # A candidate is dominated if another one is at least as fast and as accurate, and strictly better on one
+    dominated = [np.any((cost <= c) & (r2 >= r) & ((cost < c) | (r2 > r))) for c, r in zip(cost, r2)]
+    report['pareto'] = ~np.array(dominated)
+    return report
+
+def select_model(report, r2_tolerance=0.005):
+    """
+    Select the fastest candidate within an accuracy budget.
+
+    Parameters
+    ----------
+    report : pandas.DataFrame
+        Report returned by `pareto_report`.
+    r2_tolerance : float, optional
+        Maximum validation R² loss allowed compared to the most accurate
+        candidate (default is 0.005).
+
+    Returns
+    -------
+    pandas.Series
+        Row of the report for the candidate with the lowest batch latency.
+    """
+    eligible = report[report['r2'] >= report['r2'].max() - r2_tolerance]
+    return eligible.sort_values(['batch latency (ms)', 'r2'], ascending=[True, False]).iloc[0]
@@ -1,7 +1,14 @@
+import os
 import joblib
 import pandas as pd
 import streamlit as st
 from Data_preprocessing.Preprocessing_app import preprocessin_app
+from Data_preprocessing.drift_monitor import DriftMonitor
+
+@st.cache_resource
+def load_drift_monitor(reference_mtime):
+    # One monitor shared by all sessions, recreated when the reference is retrained
+    return DriftMonitor(joblib.load('./Model/drift_reference.pkl'), metrics_path='./Model/drift_metrics.json')
 
 # Streamlit app for Toronto Rental Price Prediction
 
@@ -69,10 +76,13 @@ X = pd.DataFrame([{
 
 # Prediction Button
 if st.button("Predict rent"):
-    #Preprocessing steps
-    X = preprocessin_app(X)
     # Load model
     model = joblib.load('./Model/toronto_rental_model.pkl')
+    #Preprocessing steps, with the features expected by the model
+    X = preprocessin_app(X, feature_names=model.feature_names_in_)
+    # Update the drift sketches with the preprocessed listing, metrics are dumped periodically
+    if os.path.exists('./Model/drift_reference.pkl'):
+        load_drift_monitor(os.path.getmtime('./Model/drift_reference.pkl')).update(X)
     price_pred = model.predict(X)
 
     #Display the rent
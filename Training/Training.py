@@ -3,6 +3,8 @@ import numpy as np
 from sklearn.model_selection import train_test_split
 from Data_preprocessing.feature_engineering import feature_engineering_Toronto
 from Model.Pipeline import full_pipeline
+from Model.model_selection import pareto_report, select_model
+from Data_preprocessing.drift_monitor import build_reference
 from sklearn.metrics import r2_score
 import joblib
 
@@ -15,9 +17,15 @@ X = df.drop('Price($)', axis=1)
 y = df['Price($)']
 # Split the data into training and testing sets
 X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-# Create the full pipeline
-pipeline = full_pipeline(df)
-# Fit the pipeline to the training data
+# Compare validation accuracy and prediction latency over tree depths and counts
+report = pareto_report(X_train, y_train)
+print(report.to_string(index=False))
+# Keep the fastest model whose validation R² is within the accuracy budget of the best one
+selected = select_model(report, r2_tolerance=0.005)
+max_depth, n_trees = int(selected['max_depth']), int(selected['n_trees'])
+print(f"Selected model: max_depth={max_depth}, n_trees={n_trees}")
+# Refit the selected configuration on the whole training set
+pipeline = full_pipeline(df, n_estimators=n_trees, max_depth=max_depth)
 pipeline.fit(X_train, y_train)
 # Evaluate the model on the test set
 y_pred_test = pipeline.predict(X_test)
@@ -28,6 +36,8 @@ print(f"Mean Relative Error on test set: {100*(mre_test):.2f}%")
 print(f"1-Mean Relative Error on test set : {100*(1-mre_test):.2f}%")
 # Save the trained pipeline
 joblib.dump(pipeline, './Model/toronto_rental_model.pkl')
+# Save the reference sketches of the training features for drift monitoring
+joblib.dump(build_reference(X_train), './Model/drift_reference.pkl')
 
 
 